@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from app.services.whisper_client import get_transcription_cache_stats
+
+router = APIRouter()
+
+@router.get("/stats")
+async def cache_stats():
+    """
+    Report transcription cache usage for this worker process.
+    
+    Each worker keeps its own cache, so counters differ between workers.
+    """
+    return get_transcription_cache_stats()
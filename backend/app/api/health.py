@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Any, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
+from app.services import openai_client, whisper_client
+from app.services.openai_client import verify_openai_api
+
+router = APIRouter()
+
+# Upper bound in seconds for each dependency check
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5.0"))
+DB_HEALTH_CHECK_TIMEOUT = float(os.getenv("DB_HEALTH_CHECK_TIMEOUT", "2.0"))
+
+# Reuse a database check result for this many seconds
+DB_HEALTH_CACHE_SECONDS = float(os.getenv("DB_HEALTH_CACHE_SECONDS", "5.0"))
+
+# Reuse a successful OpenAI check for this many seconds
+OPENAI_CHECK_CACHE_SECONDS = float(os.getenv("OPENAI_CHECK_CACHE_SECONDS", "600"))
+
+# Neither service calls OpenAI: summarization is mocked and transcription
+# is mocked or runs locally
+MOCK_MODE = openai_client.USE_MOCK and (whisper_client.USE_MOCK or whisper_client.USE_LOCAL)
+_MOCK_MODE_STATUS = {"status": "mock_mode"}
+_LIVENESS_STATUS = {"status": "healthy"}
+
+_database_status: Optional[Dict[str, Any]] = None
+_database_checked_at = 0.0
+_database_check_lock = asyncio.Lock()
+
+_openai_status: Optional[Dict[str, Any]] = None
+_openai_checked_at = 0.0
+
+@router.get("")
+async def basic_health_check():
+    """Liveness probe: reports that the process is up without touching any dependency."""
+    return _LIVENESS_STATUS
+
+@router.get("/ready")
+async def readiness_check(
+    deep: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Readiness probe: verify the dependencies needed to serve requests.
+    
+    - deep: Also check that the OpenAI API is reachable (makes an outbound call)
+    """
+    probes = {"database": _cached_database_health(db)}
+    if deep:
+        probes["openai"] = _check_openai_health()
+    
+    # Run dependency checks concurrently, each bounded by the timeout
+    results = await asyncio.gather(
+        *(asyncio.wait_for(probe, timeout=HEALTH_CHECK_TIMEOUT) for probe in probes.values()),
+        return_exceptions=True
+    )
+    
+    checks = {"configuration": _check_configuration_health()}
+    for name, result in zip(probes, results):
+        if isinstance(result, asyncio.TimeoutError):
+            result = {"status": "unhealthy", "message": f"Check timed out after {HEALTH_CHECK_TIMEOUT}s"}
+        elif isinstance(result, Exception):
+            result = {"status": "unhealthy", "message": str(result)}
+        checks[name] = result
+    
+    is_ready = all(check["status"] != "unhealthy" for check in checks.values())
+    
+    return ORJSONResponse(
+        content={"status": "ready" if is_ready else "not_ready", "checks": checks},
+        status_code=200 if is_ready else 503
+    )
+
+async def _cached_database_health(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Return a recent database check result, running the check at most once per TTL.
+    
+    Concurrent probes wait on the same check instead of each querying the database.
+    """
+    global _database_status, _database_checked_at
+    
+    if _database_status and time.monotonic() - _database_checked_at < DB_HEALTH_CACHE_SECONDS:
+        return _database_status
+    
+    async with _database_check_lock:
+        # Another probe may have refreshed the result while we waited
+        if _database_status and time.monotonic() - _database_checked_at < DB_HEALTH_CACHE_SECONDS:
+            return _database_status
+        
+        _database_status = await _check_database_health(db)
+        _database_checked_at = time.monotonic()
+    
+    return _database_status
+
+async def _check_database_health(db: AsyncSession) -> Dict[str, Any]:
+    """Run a trivial query to confirm the database accepts connections."""
+    try:
+        await asyncio.wait_for(db.execute(text("SELECT 1")), timeout=DB_HEALTH_CHECK_TIMEOUT)
+        return {"status": "healthy"}
+    except asyncio.TimeoutError:
+        return {"status": "unhealthy", "message": "Database check timed out"}
+    except Exception as e:
+        return {"status": "unhealthy", "message": str(e)}
+
+def _check_configuration_health() -> Dict[str, Any]:
+    """Confirm an OpenAI API key is configured unless both services are mocked."""
+    if MOCK_MODE:
+        return _MOCK_MODE_STATUS
+    
+    if not openai_client.OPENAI_API_KEY:
+        return {"status": "unhealthy", "message": "OPENAI_API_KEY is not set"}
+    
+    return {"status": "healthy"}
+
+async def _check_openai_health() -> Dict[str, Any]:
+    """Check that the OpenAI API is reachable with the configured key."""
+    global _openai_status, _openai_checked_at
+    
+    if MOCK_MODE:
+        return _MOCK_MODE_STATUS
+    
+    # Only healthy results are cached so failures are re-checked immediately
+    if _openai_status and time.monotonic() - _openai_checked_at < OPENAI_CHECK_CACHE_SECONDS:
+        return _openai_status
+    
+    try:
+        status = await verify_openai_api()
+    except Exception as e:
+        return {"status": "unhealthy", "message": str(e)}
+    
+    if status["status"] == "healthy":
+        _openai_status = status
+        _openai_checked_at = time.monotonic()
+    
+    return status
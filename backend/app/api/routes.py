@@ -1,13 +1,10 @@
 from fastapi import APIRouter
-from app.api import transcribe, summarize
+from app.api import cache, health, transcribe, summarize
 
 router = APIRouter()
 
 # Include sub-routers
 router.include_router(transcribe.router, prefix="/transcribe", tags=["transcription"])
 router.include_router(summarize.router, prefix="/summarize", tags=["summarization"])
-
-@router.get("/health")
-async def health_check():
-    """Health check endpoint for the API."""
-    return {"status": "healthy"} 
\ No newline at end of file
+router.include_router(health.router, prefix="/health", tags=["health"])
+router.include_router(cache.router, prefix="/cache", tags=["cache"]) 
\ No newline at end of file
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from app.config import OPENAI_CONCURRENCY
 from app.services.openai_client import summarize_text
 from app.db.session import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 class SummarizeRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     text: str
     question: str
     question_type: str = "open"  # open, yes_no, likert
@@ -15,6 +19,8 @@ class SummarizeRequest(BaseModel):
     language: Optional[str] = None
 
 class SummarizeResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     summary: str
     analysis: Dict
     question_id: Optional[str] = None
@@ -22,7 +28,7 @@ class SummarizeResponse(BaseModel):
 @router.post("/", response_model=SummarizeResponse)
 async def summarize_response(
     data: SummarizeRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Summarize and analyze a text response based on the question context.
@@ -44,11 +50,12 @@ async def summarize_response(
         
         # TODO: Store summary in database if session_id is provided
         
-        return SummarizeResponse(
-            summary=summary,
-            analysis=analysis,
-            question_id=data.session_id
-        )
+        # response_model validates the dict once on the way out
+        return {
+            "summary": summary,
+            "analysis": analysis,
+            "question_id": data.session_id
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Summarization failed: {str(e)}")
@@ -57,30 +64,45 @@ async def summarize_response(
 async def batch_summarize(
     responses: List[SummarizeRequest],
     language: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Process multiple responses in a batch."""
-    try:
-        results = []
-        for response in responses:
-            # Override language if provided at batch level
-            if language:
-                response.language = language
-                
+    """
+    Process multiple responses in a batch.
+    
+    Responses are summarized concurrently, at most OPENAI_CONCURRENCY at a time.
+    A failed item is reported in its own result entry without failing the batch.
+    """
+    semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+    
+    async def summarize_one(response: SummarizeRequest) -> Dict:
+        async with semaphore:
             summary, analysis = await summarize_text(
                 text=response.text,
                 question=response.question,
                 question_type=response.question_type,
-                language=response.language
+                # Override language if provided at batch level
+                language=language or response.language
             )
-            
+        
+        return {
+            "summary": summary,
+            "analysis": analysis,
+            "question_id": response.session_id
+        }
+    
+    outcomes = await asyncio.gather(
+        *(summarize_one(response) for response in responses),
+        return_exceptions=True
+    )
+    
+    results = []
+    for response, outcome in zip(responses, outcomes):
+        if isinstance(outcome, Exception):
             results.append({
-                "summary": summary,
-                "analysis": analysis,
-                "question_id": response.session_id
+                "question_id": response.session_id,
+                "error": f"Summarization failed: {str(outcome)}"
             })
-        
-        return {"results": results}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Batch summarization failed: {str(e)}") 
\ No newline at end of file
+        else:
+            results.append(outcome)
+    
+    return {"results": results}
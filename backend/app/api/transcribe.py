@@ -1,20 +1,42 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import JSONResponse
-from typing import Optional
-from app.services.whisper_client import transcribe_audio
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
+from typing import Dict, List, Optional
+from app.services import whisper_client
+from app.services.whisper_client import transcribe_audio, transcribe_audio_many, transcribe_pcm
 from app.db.session import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
 import uuid
 
 router = APIRouter()
 
+# Whisper rejects uploads over 25 MB, so refuse them before any upstream work
+MAX_AUDIO_FILE_SIZE_MB = int(os.getenv("MAX_AUDIO_FILE_SIZE_MB", "25"))
+MAX_AUDIO_FILE_SIZE = MAX_AUDIO_FILE_SIZE_MB * 1024 * 1024
+
+# Audio formats accepted by the Whisper API
+_ALLOWED_AUDIO_TYPES = frozenset({
+    "audio/flac",
+    "audio/m4a",
+    "audio/mp3",
+    "audio/mp4",
+    "audio/mpeg",
+    "audio/ogg",
+    "audio/wav",
+    "audio/wave",
+    "audio/webm",
+    "audio/x-m4a",
+    "audio/x-wav"
+})
+
+# Bytes per sample for the raw PCM formats accepted by /raw
+_SAMPLE_WIDTHS = {"f32": 4, "s16": 2}
+
 @router.post("/")
 async def transcribe_audio_file(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     session_id: Optional[str] = None,
     language: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Transcribe an audio file using Whisper.
@@ -23,22 +45,125 @@ async def transcribe_audio_file(
     - session_id: Optional session ID to associate with this transcription
     - language: Optional language code (en, de) to help transcription
     """
-    if not file.content_type.startswith("audio/"):
-        raise HTTPException(status_code=400, detail="File must be an audio file")
+    content_type = _validate_audio_upload(file)
     
     try:
         # Generate unique ID if not provided
         if not session_id:
             session_id = str(uuid.uuid4())
         
-        # Get audio content
-        audio_content = await file.read()
+        # Hand over the spooled upload instead of reading it into memory
+        transcription = await transcribe_audio(
+            file.file,
+            language,
+            filename=file.filename or "audio.wav",
+            content_type=content_type
+        )
         
-        # Call transcription service
-        transcription = await transcribe_audio(audio_content, language)
+        # TODO: Store transcription in database if configured
         
-        # TODO: Implement background task for storage if configured
-        # background_tasks.add_task(store_transcription, transcription, session_id, db)
+        return {
+            "session_id": session_id,
+            "transcription": transcription,
+            "success": True
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}") 
+
+@router.post("/batch")
+async def batch_transcribe(
+    files: List[UploadFile] = File(...),
+    session_id: Optional[str] = None,
+    language: Optional[str] = None
+):
+    """
+    Transcribe multiple audio files in a batch.
+    
+    Files are transcribed concurrently, at most OPENAI_CONCURRENCY at a time.
+    A failed file is reported in its own result entry without failing the batch.
+    """
+    # Reject the whole batch up front if any file is invalid
+    content_types = [_validate_audio_upload(file) for file in files]
+    
+    if not session_id:
+        session_id = str(uuid.uuid4())
+    
+    outcomes = await transcribe_audio_many(
+        [
+            (file.file, file.filename or "audio.wav", content_type)
+            for file, content_type in zip(files, content_types)
+        ],
+        language
+    )
+    
+    results: List[Dict] = []
+    for file, outcome in zip(files, outcomes):
+        if isinstance(outcome, Exception):
+            results.append({
+                "filename": file.filename,
+                "error": f"Transcription failed: {str(outcome)}"
+            })
+        else:
+            results.append({
+                "filename": file.filename,
+                "transcription": outcome
+            })
+    
+    return {"session_id": session_id, "results": results}
+
+@router.post("/raw")
+async def transcribe_raw_audio(
+    request: Request,
+    session_id: Optional[str] = None,
+    language: Optional[str] = None
+):
+    """
+    Transcribe raw PCM samples with the local Whisper backend.
+    
+    - body: 16 kHz mono little-endian samples (application/octet-stream)
+    - X-Sample-Rate header: Must be 16000 if sent
+    - X-Sample-Format header: "f32" (default) for float32 or "s16" for int16 samples
+    - session_id: Optional session ID to associate with this transcription
+    - language: Optional language code (en, de) to help transcription
+    """
+    if request.headers.get("x-sample-rate", "16000") != "16000":
+        raise HTTPException(status_code=400, detail="Raw audio must be sampled at 16000 Hz")
+    
+    sample_format = request.headers.get("x-sample-format", "f32")
+    if sample_format not in _SAMPLE_WIDTHS:
+        raise HTTPException(status_code=400, detail="Raw audio must be f32 or s16 samples")
+    
+    if not (whisper_client.USE_LOCAL or whisper_client.USE_MOCK):
+        raise HTTPException(status_code=400, detail="Raw audio requires the local Whisper backend")
+    
+    try:
+        content_length = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    
+    if content_length > MAX_AUDIO_FILE_SIZE:
+        raise _audio_too_large()
+    
+    # Count while reading: chunked requests carry no Content-Length to check up front
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_AUDIO_FILE_SIZE:
+            raise _audio_too_large()
+        chunks.append(chunk)
+    pcm_data = b"".join(chunks)
+    if not pcm_data:
+        raise HTTPException(status_code=400, detail="Raw audio body is empty")
+    if len(pcm_data) % _SAMPLE_WIDTHS[sample_format]:
+        raise HTTPException(status_code=400, detail=f"Raw audio is not a whole number of {sample_format} samples")
+    
+    try:
+        if not session_id:
+            session_id = str(uuid.uuid4())
+        
+        transcription = await transcribe_pcm(pcm_data, language, sample_format)
         
         return {
             "session_id": session_id,
@@ -47,4 +172,23 @@ async def transcribe_audio_file(
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+
+def _audio_too_large() -> HTTPException:
+    """Build the 413 error for audio above MAX_AUDIO_FILE_SIZE."""
+    return HTTPException(
+        status_code=413,
+        detail=f"Audio exceeds the {MAX_AUDIO_FILE_SIZE_MB} MB limit"
+    )
+
+def _validate_audio_upload(file: UploadFile) -> str:
+    """Check an upload's type and size, returning its bare content type."""
+    # Ignore parameters such as "audio/webm;codecs=opus"
+    content_type = (file.content_type or "").split(";", 1)[0]
+    if content_type not in _ALLOWED_AUDIO_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported audio type")
+    
+    if file.size is not None and file.size > MAX_AUDIO_FILE_SIZE:
+        raise _audio_too_large()
+    
+    return content_type
@@ -0,0 +1,27 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables once per process; modules read settings from here
+# or call os.getenv after importing this module
+load_dotenv()
+
+# OpenAI
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+# Maximum number of concurrent OpenAI calls per batch request
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+
+# Development settings
+USE_MOCK_TRANSCRIPTION = os.getenv("USE_MOCK_TRANSCRIPTION", "False").lower() == "true"
+USE_MOCK_SUMMARIZATION = os.getenv("USE_MOCK_SUMMARIZATION", "False").lower() == "true"
+
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" for structured one-line records, "text" for human-readable output
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# Database
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    "postgresql://postgres:postgres@db:5432/voiceform"
+)
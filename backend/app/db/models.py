@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ForeignKey, JSON, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import datetime
@@ -58,12 +59,23 @@ class Session(Base):
 
 class Response(Base):
     __tablename__ = "responses"
+    __table_args__ = (
+        # Serves "latest responses for a question" without a scan and sort;
+        # B-tree indexes read backwards, so DESC ordering is covered too
+        Index("ix_responses_question_created", "question_id", "created_at"),
+        Index("ix_responses_transcription_ts", "transcription_ts", postgresql_using="gin"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     session_id = Column(String, ForeignKey("sessions.id"))
     question_id = Column(String, ForeignKey("questions.id"))
     audio_path = Column(String, nullable=True)  # Path to stored audio if retained
     transcription = Column(Text, nullable=True)
+    # Full-text search vector over the transcription, maintained by Postgres
+    transcription_ts = Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(transcription, ''))", persisted=True)
+    )
     summary = Column(Text, nullable=True)
     analysis = Column(JSON, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
@@ -1,30 +1,97 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
+from uuid import uuid4
+from app.config import DATABASE_URL
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Get database URL from environment or use a default SQLite database
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "postgresql://postgres:postgres@db:5432/voiceform"
-)
+# The async engine talks to Postgres through asyncpg
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+# Connection pool settings per worker process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections opened at startup; the rest of the pool fills on demand
+DB_POOL_WARMUP = min(int(os.getenv("DB_POOL_WARMUP", "5")), DB_POOL_SIZE)
+
+# Set when DATABASE_URL points at PgBouncer in transaction pooling mode,
+# which already pools server connections
+DB_USE_PGBOUNCER = os.getenv("DB_USE_PGBOUNCER", "False").lower() == "true"
 
-# Create SQLAlchemy engine
-engine = create_engine(
+# Identify our connections and stop runaway queries on the Postgres side
+connect_args = {}
+if DATABASE_URL.startswith("postgresql+asyncpg"):
+    connect_args = {
+        "timeout": 5,
+        "server_settings": {
+            "application_name": "voiceform-api",
+            "statement_timeout": "2000",
+            "idle_in_transaction_session_timeout": "5000"
+        }
+    }
+
+# Let PgBouncer do the pooling instead of pooling twice
+if DB_USE_PGBOUNCER:
+    pool_args = {"poolclass": NullPool}
+    # Prepared statements do not survive transaction pooling: disable asyncpg's
+    # cache and give the statements SQLAlchemy still prepares unique names, so
+    # they cannot collide with other clients' on a shared server connection
+    connect_args["statement_cache_size"] = 0
+    connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    # PgBouncer rejects startup parameters it does not track, so the timeouts
+    # must be set on the database role instead (see README)
+    if "server_settings" in connect_args:
+        connect_args["server_settings"].pop("statement_timeout")
+        connect_args["server_settings"].pop("idle_in_transaction_session_timeout")
+else:
+    pool_args = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,  # Replace connections dropped by the server
+        "pool_recycle": 1800,
+        "pool_use_lifo": True,  # Reuse warm connections; idle ones age out
+    }
+
+# Create async SQLAlchemy engine
+engine = create_async_engine(
     DATABASE_URL,
+    connect_args=connect_args,
+    **pool_args
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db 
+
+async def warm_up_pool() -> None:
+    """
+    Open DB_POOL_WARMUP connections before the first request needs them.
+    
+    Connections are returned to the pool already authenticated. Failures are
+    logged rather than raised so the app still starts while the database is down.
+    """
+    if DB_USE_PGBOUNCER:
+        return
+    
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(DB_POOL_WARMUP)),
+        return_exceptions=True
+    )
+    
+    connections = [result for result in results if not isinstance(result, Exception)]
+    for connection in connections:
+        await connection.close()
+    
+    if len(connections) < len(results):
+        error = next(result for result in results if isinstance(result, Exception))
+        logger.warning("Database pool warm-up opened %d/%d connections: %s", len(connections), len(results), error)
@@ -1,12 +1,36 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import router as api_router
+from app.db.session import warm_up_pool
+from app.services import whisper_client
+from app.services.http_client import close_openai_client, get_openai_client
+from app.utils.logger import setup_logger, start_log_listener, stop_log_listener
+
+# Application modules log under "app.*" and propagate to this logger
+setup_logger("app")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared connections on startup and close outbound ones on shutdown."""
+    # Restart logging if an earlier lifespan in this process stopped it
+    start_log_listener()
+    get_openai_client()
+    await warm_up_pool()
+    await whisper_client.warmup()
+    yield
+    await close_openai_client()
+    stop_log_listener()
 
 app = FastAPI(
     title="VoiceForm AI",
     description="A voice-first, multilingual intake tool for structured questionnaires.",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -14,13 +38,40 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # TODO: Change to specific origins in production
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=[
+        "Accept",
+        "Accept-Language",
+        "Authorization",
+        "Content-Type",
+        "X-Sample-Format",
+        "X-Sample-Rate",
+    ],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
+# Static payload, built once
+_ROOT_MESSAGE = {"message": "Welcome to VoiceForm AI. Access the API at /api"}
+
 @app.get("/")
 async def root():
-    return {"message": "Welcome to VoiceForm AI. Access the API at /api"} 
\ No newline at end of file
+    return _ROOT_MESSAGE 
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # Production entry point: one worker per core (capped) on uvloop + httptools.
+    # Exported so workers can size their per-process thread pools to match
+    os.environ.setdefault("WEB_CONCURRENCY", str(min(os.cpu_count() or 1, 4)))
+    
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ["WEB_CONCURRENCY"])
+    )
@@ -0,0 +1,42 @@
+import httpx
+from typing import Optional
+from app.config import OPENAI_API_KEY
+
+OPENAI_BASE_URL = "https://api.openai.com"
+
+# Shared client so calls to OpenAI reuse pooled keep-alive connections
+_openai_client: Optional[httpx.AsyncClient] = None
+
+def get_openai_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client for the OpenAI API, creating it on first use.
+
+    The client carries the base URL and Authorization header, so callers
+    only pass the endpoint path and request-specific options. The app
+    lifespan opens it at startup and closes it at shutdown; lazy creation
+    covers code running outside the app, such as scripts and tests.
+    """
+    global _openai_client
+
+    if _openai_client is None or _openai_client.is_closed:
+        headers = {}
+        if OPENAI_API_KEY:
+            headers["Authorization"] = f"Bearer {OPENAI_API_KEY}"
+
+        _openai_client = httpx.AsyncClient(
+            base_url=OPENAI_BASE_URL,
+            headers=headers,
+            timeout=httpx.Timeout(30.0, connect=5.0),  # Fail fast if OpenAI is unreachable
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            http2=True  # Multiplex concurrent calls over one TLS connection
+        )
+
+    return _openai_client
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client and release its pooled connections."""
+    global _openai_client
+
+    if _openai_client is not None:
+        await _openai_client.aclose()
+        _openai_client = None
@@ -1,17 +1,10 @@
-import os
 import json
+import functools
 from typing import Dict, Any, Tuple, Optional
 import httpx
 import logging
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Get API key from environment
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-USE_MOCK = os.getenv("USE_MOCK_SUMMARIZATION", "False").lower() == "true"
+from app.config import OPENAI_API_KEY, OPENAI_MODEL, USE_MOCK_SUMMARIZATION as USE_MOCK
+from app.services.http_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -61,11 +54,6 @@ Analyze the response according to the instructions.
 """
     
     # Prepare API request
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "model": OPENAI_MODEL,
         "messages": [
@@ -78,39 +66,66 @@ Analyze the response according to the instructions.
     
     # Make API request
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30.0
-            )
+        client = get_openai_client()
+        response = await client.post(
+            "/v1/chat/completions",
+            json=payload
+        )
+        
+        # Check for success and parse response
+        if response.status_code == 200:
+            response_data = response.json()
+            content = response_data["choices"][0]["message"]["content"]
             
-            # Check for success and parse response
-            if response.status_code == 200:
-                response_data = response.json()
-                content = response_data["choices"][0]["message"]["content"]
-                
-                # Parse the JSON response
-                result = json.loads(content)
-                
-                # Extract summary and analysis
-                summary = result.get("summary", "")
-                analysis = result.get("analysis", {})
-                
-                return summary, analysis
-            else:
-                # Handle API error
-                error_detail = response.json().get("error", {}).get("message", "Unknown error")
-                logger.error(f"Summarization API error: {error_detail}")
-                raise Exception(f"Summarization failed: {error_detail}")
+            # Parse the JSON response
+            result = json.loads(content)
+            
+            # Extract summary and analysis
+            summary = result.get("summary", "")
+            analysis = result.get("analysis", {})
+            
+            return summary, analysis
+        else:
+            # Handle API error
+            error_detail = response.json().get("error", {}).get("message", "Unknown error")
+            logger.error("Summarization API error: %s", error_detail)
+            raise Exception(f"Summarization failed: {error_detail}")
                 
     except Exception as e:
         logger.exception("Error in summarization service")
         raise
 
+async def verify_openai_api() -> Dict[str, Any]:
+    """
+    Check that the OpenAI API accepts our key and serves the configured model.
+    
+    Returns:
+        Dict with a "status" of "healthy" or "unhealthy" and optional details
+    """
+    if not OPENAI_API_KEY:
+        return {"status": "unhealthy", "message": "OpenAI API key is not configured"}
+    
+    client = get_openai_client()
+    response = await client.get(f"/v1/models/{OPENAI_MODEL}", timeout=httpx.Timeout(10.0, connect=5.0))
+    
+    if response.status_code == 200:
+        return {"status": "healthy", "model": OPENAI_MODEL}
+    
+    if response.status_code == 404:
+        # The key was accepted but the configured model is not available to it
+        return {"status": "unhealthy", "message": f"Model {OPENAI_MODEL} is not available"}
+    
+    error_detail = response.json().get("error", {}).get("message", "Unknown error")
+    logger.error("OpenAI API check failed: %s", error_detail)
+    return {"status": "unhealthy", "message": error_detail}
+
+@functools.lru_cache(maxsize=16)
 def _build_system_prompt(question_type: str, language: str) -> str:
-    """Build the system prompt based on question type and language."""
+    """
+    Build the system prompt based on question type and language.
+    
+    Cached: there are only a handful of (question_type, language) combinations.
+    """
     base_prompt = """
 You are an AI assistant that analyzes responses to structured questions.
 Provide a concise summary and detailed analysis of the user's response.
@@ -1,50 +1,148 @@
 import os
-import tempfile
+import asyncio
+import hashlib
+import threading
+import time
 import httpx
-from typing import Optional, Dict, Any
-import base64
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
 import logging
-from dotenv import load_dotenv
+from app.config import OPENAI_API_KEY, OPENAI_CONCURRENCY, USE_MOCK_TRANSCRIPTION as USE_MOCK
+from app.services.http_client import get_openai_client
+from starlette.concurrency import run_in_threadpool
 
-# Load environment variables
-load_dotenv()
+# Local faster-whisper backend (requires `pip install faster-whisper`)
+USE_LOCAL = os.getenv("USE_LOCAL_TRANSCRIPTION", "False").lower() == "true"
+# A model size name (downloaded on first use) or a pre-converted CTranslate2 model directory
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+LOCAL_WHISPER_DEVICE = os.getenv("LOCAL_WHISPER_DEVICE", "cpu")
+# int8 weights halve memory bandwidth; on GPUs keep activations in float16
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv(
+    "LOCAL_WHISPER_COMPUTE_TYPE",
+    "int8_float16" if LOCAL_WHISPER_DEVICE == "cuda" else "int8"
+)
+# Half the cores by default, leaving the rest for the event loop and request I/O,
+# shared between the server's worker processes so they do not oversubscribe
+_WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+LOCAL_WHISPER_CPU_THREADS = int(os.getenv(
+    "LOCAL_WHISPER_CPU_THREADS",
+    str(max(1, (os.cpu_count() or 2) // 2 // _WEB_WORKERS))
+))
+# Speech segments decoded together per clip; 1 disables batched inference
+LOCAL_WHISPER_BATCH_SIZE = int(os.getenv("LOCAL_WHISPER_BATCH_SIZE", "8"))
+# Pauses longer than this split speech segments; the silence between them is skipped
+LOCAL_WHISPER_MIN_SILENCE_MS = int(os.getenv("LOCAL_WHISPER_MIN_SILENCE_MS", "500"))
 
-# Get API key from environment
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-USE_MOCK = os.getenv("USE_MOCK_TRANSCRIPTION", "False").lower() == "true"
+# Clips decoded at the same time; each uses LOCAL_WHISPER_CPU_THREADS threads
+LOCAL_WHISPER_CONCURRENCY = int(os.getenv("LOCAL_WHISPER_CONCURRENCY", "1"))
+
+# OpenMP/MKL read these once when numpy and ctranslate2 load, which happens
+# lazily on the local path, so capping them here avoids oversubscribing cores
+if USE_LOCAL:
+    os.environ.setdefault("OMP_NUM_THREADS", str(LOCAL_WHISPER_CPU_THREADS))
+    os.environ.setdefault("MKL_NUM_THREADS", str(LOCAL_WHISPER_CPU_THREADS))
+
+# Number of transcriptions remembered by audio content; 0 disables the cache
+TRANSCRIPTION_CACHE_SIZE = int(os.getenv("TRANSCRIPTION_CACHE_SIZE", "512"))
 
 logger = logging.getLogger(__name__)
 
-async def transcribe_audio(audio_data: bytes, language: Optional[str] = None) -> str:
+# Returned as-is in mock mode; the readiness probe reports when mock services are active
+_MOCK_TRANSCRIPTION = "This is a mock transcription for development purposes."
+
+_local_model = None
+_local_model_lock = threading.Lock()
+# asyncio primitives bind to the running loop on first use, so this is safe at import
+_local_semaphore = asyncio.Semaphore(LOCAL_WHISPER_CONCURRENCY)
+
+# LRU of (audio digest, language) -> transcription; only touched on the event loop
+_transcription_cache: "OrderedDict[Tuple[bytes, Optional[str]], str]" = OrderedDict()
+_cache_hits = 0
+_cache_misses = 0
+
+async def transcribe_audio(
+    audio_file: BinaryIO,
+    language: Optional[str] = None,
+    filename: str = "audio.wav",
+    content_type: str = "audio/wav"
+) -> str:
     """
-    Transcribe audio data using OpenAI's Whisper API.
+    Transcribe audio using OpenAI's Whisper API, or a local faster-whisper
+    model when USE_LOCAL_TRANSCRIPTION is set.
+    
+    Results are cached by audio content and language, so resubmitting the
+    same clip returns without another transcription.
     
     Args:
-        audio_data: Raw audio bytes
+        audio_file: Readable binary file object positioned at the start of the audio
         language: Optional language code to help transcription (en, de)
+        filename: Upload name; Whisper detects the audio format from its extension
+        content_type: MIME type of the audio
         
     Returns:
         Transcribed text
     """
     # Use mock transcription for development/testing if configured
     if USE_MOCK:
-        logger.info("Using mock transcription service")
-        return "This is a mock transcription for development purposes."
+        return _MOCK_TRANSCRIPTION
     
+    cache_key = None
+    if TRANSCRIPTION_CACHE_SIZE:
+        # Hashing reads the whole upload, which may have rolled over to disk
+        cache_key = (await run_in_threadpool(_file_digest, audio_file), language)
+        cached = _get_cached_transcription(cache_key)
+        if cached is not None:
+            return cached
+    
+    if USE_LOCAL:
+        transcription = await _run_locally(_transcribe_locally, audio_file, language)
+    else:
+        transcription = await _transcribe_with_openai(audio_file, language, filename, content_type)
+    
+    if cache_key:
+        _cache_transcription(cache_key, transcription)
+    
+    return transcription
+
+async def transcribe_audio_many(
+    uploads: Sequence[Tuple[BinaryIO, str, str]],
+    language: Optional[str] = None,
+    concurrency: int = OPENAI_CONCURRENCY
+) -> List[Union[str, Exception]]:
+    """
+    Transcribe several clips concurrently, at most `concurrency` at a time.
+    
+    Args:
+        uploads: (audio_file, filename, content_type) for each clip
+        language: Optional language code to help transcription (en, de)
+        concurrency: Maximum number of clips in flight
+        
+    Returns:
+        One entry per clip, in order: the transcribed text, or the exception
+        that clip raised, so one failure does not discard the others
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def transcribe_one(audio_file: BinaryIO, filename: str, content_type: str) -> str:
+        async with semaphore:
+            return await transcribe_audio(audio_file, language, filename=filename, content_type=content_type)
+    
+    return await asyncio.gather(
+        *(transcribe_one(*upload) for upload in uploads),
+        return_exceptions=True
+    )
+
+async def _transcribe_with_openai(
+    audio_file: BinaryIO,
+    language: Optional[str],
+    filename: str,
+    content_type: str
+) -> str:
+    """Send audio to the OpenAI Whisper API and return the transcribed text."""
     if not OPENAI_API_KEY:
         raise ValueError("OpenAI API key is required for transcription")
     
-    # Create a temporary file for the audio data
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
-        temp_audio.write(audio_data)
-        temp_audio_path = temp_audio.name
-    
     try:
-        # Prepare API request
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}"
-        }
-        
         # Prepare form data with optional language parameter
         form_data = {
             "model": "whisper-1",
@@ -54,36 +152,246 @@ async def transcribe_audio(audio_data: bytes, language: Optional[str] = None) ->
         if language:
             form_data["language"] = language
         
-        # Open the temporary file for API upload
+        # Stream the upload into the multipart body without copying it
         files = {
-            "file": ("audio.wav", open(temp_audio_path, "rb"), "audio/wav")
+            "file": (filename, _UploadReader(audio_file), content_type)
         }
         
         # Make API request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/audio/transcriptions",
-                headers=headers,
-                data=form_data,
-                files=files,
-                timeout=30.0  # Longer timeout for audio processing
-            )
-            
-            # Check for success and return transcription
-            if response.status_code == 200:
-                # For text response format, the response is just the text
-                return response.text.strip()
-            else:
-                # Handle API error
-                error_detail = response.json().get("error", {}).get("message", "Unknown error")
-                logger.error(f"Transcription API error: {error_detail}")
-                raise Exception(f"Transcription failed: {error_detail}")
+        client = get_openai_client()
+        response = await client.post(
+            "/v1/audio/transcriptions",
+            data=form_data,
+            files=files,
+            timeout=httpx.Timeout(60.0, connect=5.0)  # Longer timeout for audio processing
+        )
+        
+        # Check for success and return transcription
+        if response.status_code == 200:
+            # For text response format, the response is just the text
+            return response.text.strip()
+        else:
+            # Handle API error
+            error_detail = response.json().get("error", {}).get("message", "Unknown error")
+            logger.error("Transcription API error: %s", error_detail)
+            raise Exception(f"Transcription failed: {error_detail}")
                 
     except Exception as e:
         logger.exception("Error in transcription service")
         raise
+
+class _UploadReader:
+    """
+    Expose only read/seek/tell of an upload file.
+    
+    httpx sizes multipart files via fileno() when available, which makes a
+    SpooledTemporaryFile roll over to disk; without it, httpx seeks instead
+    and small uploads stay in memory.
+    """
+    
+    def __init__(self, audio_file: BinaryIO):
+        self._file = audio_file
+    
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+    
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+    
+    def tell(self) -> int:
+        return self._file.tell()
+
+def _file_digest(audio_file: BinaryIO) -> bytes:
+    """Hash a file's content in chunks, then rewind it for the actual upload."""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: audio_file.read(64 * 1024), b""):
+        digest.update(chunk)
+    audio_file.seek(0)
+    return digest.digest()
+
+def _pcm_digest(pcm_data: bytes, sample_format: str) -> bytes:
+    """Hash raw PCM together with its sample format."""
+    digest = hashlib.blake2b(pcm_data, digest_size=16)
+    digest.update(sample_format.encode())
+    return digest.digest()
+
+def _get_cached_transcription(key: Tuple[bytes, Optional[str]]) -> Optional[str]:
+    """Return a cached transcription and mark it as recently used."""
+    global _cache_hits, _cache_misses
+    
+    transcription = _transcription_cache.get(key)
+    if transcription is None:
+        _cache_misses += 1
+    else:
+        _cache_hits += 1
+        _transcription_cache.move_to_end(key)
+    return transcription
+
+def _cache_transcription(key: Tuple[bytes, Optional[str]], transcription: str) -> None:
+    """Store a transcription, evicting the least recently used one when full."""
+    _transcription_cache[key] = transcription
+    _transcription_cache.move_to_end(key)
+    if len(_transcription_cache) > TRANSCRIPTION_CACHE_SIZE:
+        _transcription_cache.popitem(last=False)
+
+def get_transcription_cache_stats() -> Dict[str, Any]:
+    """
+    Report how the transcription cache is being used.
+    
+    Returns:
+        Dict with the current and maximum entry counts and the hit/miss counters
+    """
+    lookups = _cache_hits + _cache_misses
+    return {
+        "size": len(_transcription_cache),
+        "max_size": TRANSCRIPTION_CACHE_SIZE,
+        "hits": _cache_hits,
+        "misses": _cache_misses,
+        "hit_rate": _cache_hits / lookups if lookups else 0.0
+    }
+
+async def transcribe_pcm(
+    pcm_data: bytes,
+    language: Optional[str] = None,
+    sample_format: str = "f32"
+) -> str:
+    """
+    Transcribe raw PCM samples with the local Whisper model.
+    
+    Skips container parsing and decoding, since the samples are already in the
+    format the model consumes.
+    
+    Args:
+        pcm_data: 16 kHz mono little-endian samples
+        language: Optional language code to help transcription (en, de)
+        sample_format: "f32" for float32 samples or "s16" for int16 samples
         
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_audio_path):
-            os.unlink(temp_audio_path) 
\ No newline at end of file
+    Returns:
+        Transcribed text
+    """
+    if USE_MOCK:
+        return _MOCK_TRANSCRIPTION
+    
+    if not USE_LOCAL:
+        raise ValueError("Raw PCM transcription requires the local Whisper backend")
+    
+    cache_key = None
+    if TRANSCRIPTION_CACHE_SIZE:
+        cache_key = (await run_in_threadpool(_pcm_digest, pcm_data, sample_format), language)
+        cached = _get_cached_transcription(cache_key)
+        if cached is not None:
+            return cached
+    
+    transcription = await _run_locally(_transcribe_pcm_locally, pcm_data, language, sample_format)
+    
+    if cache_key:
+        _cache_transcription(cache_key, transcription)
+    
+    return transcription
+
+async def warmup() -> None:
+    """
+    Load the local Whisper model and run one silent clip through it.
+    
+    Moves the model download/load and first-inference setup out of the first
+    user request. Does nothing unless the local backend is enabled.
+    """
+    if USE_MOCK or not USE_LOCAL:
+        return
+    
+    started = time.monotonic()
+    await _run_locally(_warm_up_locally)
+    logger.info("Local Whisper model warmed up in %.1fs", time.monotonic() - started)
+
+async def _run_locally(func, *args) -> Any:
+    """Run blocking local inference in a worker thread, bounded by LOCAL_WHISPER_CONCURRENCY."""
+    # Inference is CPU-bound, so keep it off the event loop; the semaphore stops
+    # concurrent requests from each claiming LOCAL_WHISPER_CPU_THREADS cores
+    async with _local_semaphore:
+        return await run_in_threadpool(func, *args)
+
+def _warm_up_locally() -> None:
+    """Run one encode/decode pass over a second of silence."""
+    import numpy as np
+    
+    silence = np.zeros(16000, dtype=np.float32)
+    model = _get_local_model()
+    
+    # VAD would drop the whole clip before the model ran, so bypass it here
+    segments, _ = model.transcribe(silence, language="en", beam_size=1, vad_filter=False)
+    for _ in segments:
+        pass
+
+def _get_local_model():
+    """
+    Load the faster-whisper model once per process.
+    
+    With LOCAL_WHISPER_BATCH_SIZE > 1 the model is wrapped in a batched pipeline
+    that splits each clip into speech segments and decodes them together.
+    """
+    global _local_model
+    
+    if _local_model is None:
+        with _local_model_lock:
+            if _local_model is None:
+                # Imported lazily so the API backend does not need faster-whisper installed
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+                
+                logger.info("Loading local Whisper model '%s'", LOCAL_WHISPER_MODEL)
+                model = WhisperModel(
+                    LOCAL_WHISPER_MODEL,
+                    device=LOCAL_WHISPER_DEVICE,
+                    compute_type=LOCAL_WHISPER_COMPUTE_TYPE,
+                    cpu_threads=LOCAL_WHISPER_CPU_THREADS
+                )
+                
+                if LOCAL_WHISPER_BATCH_SIZE > 1:
+                    model = BatchedInferencePipeline(model=model)
+                
+                _local_model = model
+    
+    return _local_model
+
+def _transcribe_locally(audio, language: Optional[str]) -> str:
+    """Run blocking faster-whisper inference on a file object or 16 kHz float32 samples."""
+    model = _get_local_model()
+    vad_parameters = {"min_silence_duration_ms": LOCAL_WHISPER_MIN_SILENCE_MS}
+    
+    if LOCAL_WHISPER_BATCH_SIZE > 1:
+        # The batched pipeline always segments on voice activity
+        segments, _ = model.transcribe(
+            audio,
+            language=language,
+            beam_size=1,
+            batch_size=LOCAL_WHISPER_BATCH_SIZE,
+            vad_parameters=vad_parameters
+        )
+    else:
+        segments, _ = model.transcribe(
+            audio,
+            language=language,
+            beam_size=1,
+            vad_filter=True,
+            vad_parameters=vad_parameters
+        )
+    
+    # Segments are generated lazily, so decoding happens while joining
+    return " ".join(segment.text.strip() for segment in segments)
+
+def _transcribe_pcm_locally(pcm_data: bytes, language: Optional[str], sample_format: str = "f32") -> str:
+    """Transcribe raw PCM bytes, wrapping float32 input in an array without copying."""
+    # numpy ships with faster-whisper, so it is only imported on the local path
+    import numpy as np
+    
+    if sample_format == "s16":
+        samples = _pcm16_to_f32(pcm_data)
+    else:
+        samples = np.frombuffer(pcm_data, dtype="<f4")
+    
+    return _transcribe_locally(samples, language)
+
+def _pcm16_to_f32(pcm_data: bytes):
+    """Scale int16 PCM to float32 in [-1, 1) in a single vectorized pass."""
+    import numpy as np
+    
+    return np.multiply(np.frombuffer(pcm_data, dtype="<i2"), np.float32(1 / 32768), dtype=np.float32)
@@ -1,18 +1,80 @@
+import copy
+import functools
 import logging
+import logging.handlers
+import queue
 import sys
-import os
-from dotenv import load_dotenv
+import orjson
+from app.config import LOG_FORMAT, LOG_LEVEL
 
-# Load environment variables
-load_dotenv()
+_LEVEL = getattr(logging, LOG_LEVEL, logging.INFO)
 
-# Get log level from environment or default to INFO
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+class JSONFormatter(logging.Formatter):
+    """Render each record as a single-line JSON object."""
+    
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+if LOG_FORMAT == "json":
+    _FORMATTER = JSONFormatter()
+else:
+    _FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+class _UnformattedQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with their message resolved, leaving traceback formatting to the listener."""
+    
+    def prepare(self, record):
+        # Resolve msg % args now so later changes to mutable args cannot alter
+        # the message; unlike the stock prepare(), keep exc_info for the listener
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+# Loggers only enqueue records; a background thread formats and writes them,
+# so request handlers never block on stdout
+_LOG_QUEUE = queue.SimpleQueue()
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(_FORMATTER)
+_listener = logging.handlers.QueueListener(_LOG_QUEUE, _stdout_handler)
+_listener_running = False
+
+def start_log_listener():
+    """Start the background logging thread, draining anything queued while it was stopped."""
+    global _listener_running
+    
+    if not _listener_running:
+        _listener_running = True
+        _listener.start()
 
+start_log_listener()
+
+def stop_log_listener():
+    """Flush queued records and stop the background logging thread."""
+    global _listener_running
+    
+    # QueueListener.stop() fails when called twice on Python 3.11
+    if _listener_running:
+        _listener_running = False
+        _listener.stop()
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name, log_level=None):
     """
     Set up a logger with the specified name and log level.
     
+    Cached per (name, log_level), so calling it from request handlers
+    returns the configured logger without touching its level or handlers.
+    
     Args:
         name: Logger name (typically __name__ of the calling module)
         log_level: Optional override for the default log level
@@ -24,22 +86,11 @@ def setup_logger(name, log_level=None):
     logger = logging.getLogger(name)
     
     # Set log level from parameter, environment, or default to INFO
-    level = log_level or LOG_LEVEL
-    logger.setLevel(getattr(logging, level))
+    level = getattr(logging, log_level.upper(), _LEVEL) if log_level else _LEVEL
+    logger.setLevel(level)
     
-    # Create console handler if logger has no handlers
+    # Route records through the shared queue if logger has no handlers
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        # Add formatter to handler
-        handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        logger.addHandler(handler)
+        logger.addHandler(_UnformattedQueueHandler(_LOG_QUEUE))
     
     return logger 
\ No newline at end of file
@@ -0,0 +1,26 @@
+import asyncio
+import os
+import httpx
+import pytest
+import pytest_asyncio
+
+# Settings are read once at import, so configure mock services before any test imports the app
+os.environ["USE_MOCK_TRANSCRIPTION"] = "True"
+os.environ["USE_MOCK_SUMMARIZATION"] = "True"
+
+from app.main import app
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across the session so the client fixture can outlive a test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Async client that calls the app in-process, created once per test session."""
+    transport = httpx.ASGITransport(app=app)
+    # Follow redirects like TestClient, e.g. /api/transcribe -> /api/transcribe/
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", follow_redirects=True) as c:
+        yield c
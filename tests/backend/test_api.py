@@ -1,34 +1,50 @@
 import pytest
-from fastapi.testclient import TestClient
 from app.main import app
 
-client = TestClient(app)
-
-def test_root_endpoint():
+@pytest.mark.asyncio
+async def test_root_endpoint(client):
     """Test that the root endpoint returns the expected message."""
-    response = client.get("/")
+    response = await client.get("/")
     assert response.status_code == 200
     assert response.json() == {"message": "Welcome to VoiceForm AI. Access the API at /api"}
 
-def test_health_endpoint():
+@pytest.mark.asyncio
+async def test_health_endpoint(client):
     """Test that the health endpoint returns a healthy status."""
-    response = client.get("/api/health")
+    response = await client.get("/api/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
 
 @pytest.mark.asyncio
-async def test_mock_transcription():
-    """Test that the transcription endpoint works with mock data."""
-    # This requires setting USE_MOCK_TRANSCRIPTION=True in .env
-    import os
-    os.environ["USE_MOCK_TRANSCRIPTION"] = "True"
+async def test_readiness_reports_database_failure(client, monkeypatch):
+    """Test that the readiness probe returns 503 when the database is unreachable."""
+    from app.api import health
+    from app.db.session import get_db
+    monkeypatch.setattr(health, "DB_HEALTH_CACHE_SECONDS", 0)
+    
+    class UnreachableSession:
+        async def execute(self, statement):
+            raise ConnectionError("database unreachable")
     
+    app.dependency_overrides[get_db] = lambda: UnreachableSession()
+    try:
+        response = await client.get("/api/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert response.json()["checks"]["database"]["status"] == "unhealthy"
+
+@pytest.mark.asyncio
+async def test_mock_transcription(client):
+    """Test that the transcription endpoint works with mock data."""
     # Create a small dummy audio file
     from io import BytesIO
     dummy_audio = BytesIO(b"dummy audio content")
     dummy_audio.name = "test.wav"
     
-    response = client.post(
+    response = await client.post(
         "/api/transcribe",
         files={"file": ("test.wav", dummy_audio, "audio/wav")},
         data={"session_id": "test-session"}
@@ -39,12 +55,163 @@ async def test_mock_transcription():
     assert response.json()["success"] is True
 
 @pytest.mark.asyncio
-async def test_mock_summarization():
-    """Test that the summarization endpoint works with mock data."""
-    # This requires setting USE_MOCK_SUMMARIZATION=True in .env
-    import os
-    os.environ["USE_MOCK_SUMMARIZATION"] = "True"
+async def test_transcription_rejects_oversized_upload(client, monkeypatch):
+    """Test that uploads above the size limit are rejected before transcription."""
+    from app.api import transcribe
+    monkeypatch.setattr(transcribe, "MAX_AUDIO_FILE_SIZE", 8)
+    
+    response = await client.post(
+        "/api/transcribe",
+        files={"file": ("test.wav", b"dummy audio content", "audio/wav")}
+    )
+    
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_batch_transcription_reports_item_errors(client, monkeypatch):
+    """Test that one failing file does not fail the rest of a batch."""
+    from app.services import whisper_client
+    
+    async def fake_transcribe_audio(audio_file, language=None, filename="audio.wav", content_type="audio/wav"):
+        if filename == "broken.wav":
+            raise RuntimeError("upstream error")
+        return f"Text of {filename}"
+    
+    monkeypatch.setattr(whisper_client, "transcribe_audio", fake_transcribe_audio)
+    
+    response = await client.post(
+        "/api/transcribe/batch",
+        files=[
+            ("files", ("first.wav", b"first", "audio/wav")),
+            ("files", ("broken.wav", b"broken", "audio/wav"))
+        ]
+    )
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0] == {"filename": "first.wav", "transcription": "Text of first.wav"}
+    assert "error" in results[1]
+
+@pytest.mark.asyncio
+async def test_openai_upload_keeps_small_files_in_memory(monkeypatch):
+    """Test that streaming an upload to OpenAI does not spill it to disk."""
+    import tempfile
+    import httpx
+    from app.services import whisper_client
+    
+    def handler(request):
+        return httpx.Response(200, text="hello\n")
+    
+    upstream = httpx.AsyncClient(base_url="https://api.openai.com", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(whisper_client, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(whisper_client, "get_openai_client", lambda: upstream)
+    
+    upload = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    upload.write(b"dummy audio content")
+    upload.seek(0)
+    
+    transcription = await whisper_client._transcribe_with_openai(upload, None, "test.wav", "audio/wav")
+    await upstream.aclose()
+    
+    assert transcription == "hello"
+    assert not upload._rolled
+
+@pytest.mark.asyncio
+async def test_identical_audio_is_transcribed_once(client, monkeypatch):
+    """Test that resubmitting the same audio is served from the transcription cache."""
+    from collections import OrderedDict
+    from io import BytesIO
+    from app.services import whisper_client
+    
+    calls = []
+    
+    async def fake_transcribe_with_openai(audio_file, language, filename, content_type):
+        calls.append(filename)
+        return "cached text"
+    
+    monkeypatch.setattr(whisper_client, "USE_MOCK", False)
+    monkeypatch.setattr(whisper_client, "_transcribe_with_openai", fake_transcribe_with_openai)
+    monkeypatch.setattr(whisper_client, "_transcription_cache", OrderedDict())
+    monkeypatch.setattr(whisper_client, "_cache_hits", 0)
+    monkeypatch.setattr(whisper_client, "_cache_misses", 0)
+    
+    first = await whisper_client.transcribe_audio(BytesIO(b"same audio"), "en")
+    second = await whisper_client.transcribe_audio(BytesIO(b"same audio"), "en")
     
+    assert first == second == "cached text"
+    assert len(calls) == 1
+    
+    response = await client.get("/api/cache/stats")
+    assert response.json()["hits"] == 1
+    assert response.json()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_raw_transcription_rejects_other_sample_rates(client):
+    """Test that raw PCM uploads must be sampled at 16 kHz."""
+    response = await client.post(
+        "/api/transcribe/raw",
+        content=b"\x00" * 16,
+        headers={"Content-Type": "application/octet-stream", "X-Sample-Rate": "44100"}
+    )
+    
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_raw_transcription_rejects_empty_body(client):
+    """Test that a raw upload without any samples is rejected."""
+    response = await client.post(
+        "/api/transcribe/raw",
+        content=b"",
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_raw_transcription_accepts_int16_samples(client):
+    """Test that raw int16 PCM is accepted when the sample format says so."""
+    response = await client.post(
+        "/api/transcribe/raw",
+        content=b"\x00" * 6,
+        headers={"Content-Type": "application/octet-stream", "X-Sample-Format": "s16"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+def test_pcm16_to_f32_scales_to_unit_range():
+    """Test that int16 samples are converted to float32 in [-1, 1)."""
+    np = pytest.importorskip("numpy")
+    import struct
+    from app.services.whisper_client import _pcm16_to_f32
+    
+    samples = _pcm16_to_f32(struct.pack("<4h", -32768, 0, 16384, 32767))
+    
+    assert samples.dtype == np.float32
+    assert samples.tolist()[:3] == [-1.0, 0.0, 0.5]
+    assert samples[3] == pytest.approx(32767 / 32768)
+
+@pytest.mark.asyncio
+async def test_raw_transcription_rejects_oversized_chunked_body(client, monkeypatch):
+    """Test that the size limit applies to chunked uploads without a Content-Length."""
+    from app.api import transcribe
+    monkeypatch.setattr(transcribe, "MAX_AUDIO_FILE_SIZE", 8)
+    
+    async def body():
+        for _ in range(4):
+            yield b"\x00" * 1000
+    
+    response = await client.post(
+        "/api/transcribe/raw",
+        content=body(),
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_mock_summarization(client):
+    """Test that the summarization endpoint works with mock data."""
     test_data = {
         "text": "I've been sleeping quite poorly lately. It takes me about an hour to fall asleep and I wake up frequently during the night.",
         "question": "How would you describe your sleep quality over the past week?",
@@ -53,11 +220,38 @@ async def test_mock_summarization():
         "language": "en"
     }
     
-    response = client.post(
+    response = await client.post(
         "/api/summarize",
         json=test_data
     )
     
     assert response.status_code == 200
     assert "summary" in response.json()
-    assert "analysis" in response.json() 
\ No newline at end of file
+    assert "analysis" in response.json() 
+
+@pytest.mark.asyncio
+async def test_batch_summarization_reports_item_errors(client, monkeypatch):
+    """Test that one failing item does not fail the rest of a batch."""
+    from app.api import summarize
+    
+    async def fake_summarize_text(text, question, question_type, language):
+        if text == "fail":
+            raise RuntimeError("upstream error")
+        return f"Summary of {text}", {"sentiment": "neutral"}
+    
+    monkeypatch.setattr(summarize, "summarize_text", fake_summarize_text)
+    
+    items = [
+        {"text": "first", "question": "Q1", "session_id": "s1"},
+        {"text": "fail", "question": "Q2", "session_id": "s2"},
+        {"text": "third", "question": "Q3", "session_id": "s3"}
+    ]
+    
+    response = await client.post("/api/summarize/batch", json=items)
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["question_id"] for r in results] == ["s1", "s2", "s3"]
+    assert results[0]["summary"] == "Summary of first"
+    assert "error" in results[1]
+    assert results[2]["summary"] == "Summary of third"